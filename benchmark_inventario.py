@@ -0,0 +1,331 @@
+"""
+Benchmarks do Sistema de Inventário.
+
+Gera catálogos e históricos de inventário sintéticos em escalas configuráveis,
+mede os caminhos críticos da aplicação e grava os resultados em JSON para
+comparação entre commits.
+
+Exemplos:
+    python benchmark_inventario.py --materiais 10000 100000 --inventarios 10 1000
+    python benchmark_inventario.py --saida atual.json --comparar base.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+DIRETORIO_APP = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_APP = os.path.join(DIRETORIO_APP, "inventarioepiepc.py")
+
+OPCOES_TELA = {
+    "tela_cadastro_materiais": "📦 Cadastro de Materiais",
+    "tela_rotina_inventario": "📋 Rotina de Inventário",
+    "tela_relatorios": "📊 Relatórios",
+}
+
+
+# ---------------------------------------------------------------------------
+# Geradores de dados sintéticos
+# ---------------------------------------------------------------------------
+
+def gerar_catalogo(quantidade: int, semente: int = 42) -> List[Dict[str, str]]:
+    """Gera um catálogo sintético no mesmo formato de processar_excel_materiais"""
+    rng = random.Random(semente)
+    tipos = ["LUVA", "CAPACETE", "BOTINA", "ÓCULOS", "CINTO", "CABO", "CONECTOR", "ISOLADOR"]
+    tamanhos = ["P", "M", "G", "GG", "UN"]
+    return [
+        {
+            'codigo': f"MAT{i:07d}",
+            'descricao': f"{rng.choice(tipos)} {rng.choice(tamanhos)} LOTE {rng.randint(1, 9999):04d}"
+        }
+        for i in range(quantidade)
+    ]
+
+
+def gerar_planilha_materiais(materiais: List[Dict[str, str]]) -> io.BytesIO:
+    """Gera a planilha Excel de importação a partir de um catálogo"""
+    buffer = io.BytesIO()
+    df = pd.DataFrame(materiais)
+    df.columns = ['Código do Item', 'Descrição']
+    df.to_excel(buffer, index=False, engine='openpyxl')
+    buffer.seek(0)
+    return buffer
+
+
+def gerar_historico(db_path: str, codigos: List[str], quantidade_inventarios: int,
+                    itens_por_inventario: int, semente: int = 42) -> List[int]:
+    """Popula o banco com inventários sintéticos e retorna os IDs criados"""
+    rng = random.Random(semente)
+    responsaveis = ["Ana Souza", "Bruno Lima", "Carla Dias", "Diego Rocha", "Elisa Alves"]
+    inicio = datetime.now() - timedelta(days=quantidade_inventarios)
+    itens_por_inventario = min(itens_por_inventario, len(codigos))
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    ids = []
+    for i in range(quantidade_inventarios):
+        cursor.execute("""
+            INSERT INTO inventarios (responsavel, data_inventario, finalizado, versao_catalogo)
+            VALUES (?, ?, 1, (SELECT MAX(versao) FROM catalogo_versoes))
+        """, (rng.choice(responsaveis), inicio + timedelta(days=i, minutes=rng.randint(0, 600))))
+        inventario_id = cursor.lastrowid
+        ids.append(inventario_id)
+        cursor.executemany("""
+            INSERT INTO inventario_itens (inventario_id, codigo_material, quantidade, versao_catalogo)
+            VALUES (?, ?, ?, (SELECT MAX(versao) FROM catalogo_versoes))
+        """, [
+            (inventario_id, codigo, rng.randint(0, 500))
+            for codigo in rng.sample(codigos, itens_por_inventario)
+        ])
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def importar_app():
+    """Importa a aplicação sem deixar um "inventario.db" no diretório corrente"""
+    # A aplicação cria "inventario.db" no diretório corrente ao ser importada
+    with tempfile.TemporaryDirectory(prefix="bench_inventario_import_") as diretorio_import:
+        cwd_original = os.getcwd()
+        os.chdir(diretorio_import)
+        try:
+            if DIRETORIO_APP not in sys.path:
+                sys.path.insert(0, DIRETORIO_APP)
+            import inventarioepiepc
+        finally:
+            os.chdir(cwd_original)
+
+    return inventarioepiepc
+
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def medir(funcao: Callable[[int], object], repeticoes: int,
+          preparar: Optional[Callable[[int], object]] = None) -> Dict[str, float]:
+    """Executa a função várias vezes e retorna estatísticas de tempo em segundos"""
+    tempos = []
+    for i in range(repeticoes):
+        if preparar is not None:
+            preparar(i)
+        inicio = time.perf_counter()
+        funcao(i)
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        'repeticoes': repeticoes,
+        'min_s': min(tempos),
+        'mediana_s': statistics.median(tempos),
+        'media_s': statistics.mean(tempos),
+        'max_s': max(tempos),
+    }
+
+
+def medir_telas(diretorio: str, inventario_id: int, repeticoes: int, timeout: float) -> Dict[str, Dict]:
+    """Mede o rerender completo de cada tela via AppTest do Streamlit"""
+    from streamlit.testing.v1 import AppTest
+
+    resultados = {}
+    cwd_original = os.getcwd()
+    # A aplicação abre "inventario.db" no diretório corrente
+    os.chdir(diretorio)
+    try:
+        for nome, opcao in OPCOES_TELA.items():
+            at = AppTest.from_file(ARQUIVO_APP, default_timeout=timeout)
+            at.run()
+            if nome == "tela_rotina_inventario":
+                at.session_state["inventario_ativo"] = inventario_id
+                at.session_state["itens_adicionados"] = []
+            at.sidebar.selectbox[0].set_value(opcao)
+            at.run()
+            if at.exception:
+                resultados[nome] = {'erro': str(at.exception[0].message)}
+                continue
+            resultados[nome] = medir(lambda _: at.run(), repeticoes)
+    finally:
+        os.chdir(cwd_original)
+
+    return resultados
+
+
+def executar_cenario(app, quantidade_materiais: int, quantidade_inventarios: int,
+                     args: argparse.Namespace) -> Dict:
+    """Monta um banco sintético na escala pedida e mede todos os caminhos críticos"""
+    with tempfile.TemporaryDirectory(prefix="bench_inventario_") as diretorio:
+        db_path = os.path.join(diretorio, "inventario.db")
+        materiais = gerar_catalogo(quantidade_materiais, args.semente)
+        codigos = [m['codigo'] for m in materiais]
+
+        db_manager = app.DatabaseManager(db_path)
+        db_manager.inserir_materiais(materiais)
+        ids = gerar_historico(db_path, codigos, quantidade_inventarios,
+                              args.itens_por_inventario, args.semente)
+        inventario_exemplo = ids[-1]
+
+        resultados = {}
+
+        planilha = gerar_planilha_materiais(materiais)
+        resultados['processar_excel_materiais'] = medir(
+            lambda _: app.processar_excel_materiais(planilha),
+            args.repeticoes,
+            preparar=lambda _: planilha.seek(0)
+        )
+
+        resultados['inserir_materiais'] = medir(
+            lambda i: app.DatabaseManager(os.path.join(diretorio, f"importacao_{i}.db")).inserir_materiais(materiais),
+            args.repeticoes
+        )
+
+        resultados['obter_materiais'] = medir(lambda _: db_manager.obter_materiais(), args.repeticoes)
+
+        # Entrada de itens em um inventário novo, como na rotina de contagem
+        inventario_entrada = db_manager.criar_inventario("Benchmark")
+        resultados['adicionar_item_inventario'] = medir(
+            lambda i: db_manager.adicionar_item_inventario(
+                inventario_entrada, codigos[i % len(codigos)], 1
+            ),
+            args.repeticoes * 10
+        )
+
+        resultados['obter_todos_inventarios'] = medir(
+            lambda _: db_manager.obter_todos_inventarios(), args.repeticoes
+        )
+
+        resultados['obter_itens_inventario'] = medir(
+            lambda _: db_manager.obter_itens_inventario(inventario_exemplo), args.repeticoes
+        )
+
+        resultados['gerar_excel_inventario'] = medir(
+            lambda _: app.gerar_excel_inventario(inventario_exemplo, db_manager), args.repeticoes
+        )
+
+        materiais_df = db_manager.obter_materiais()
+        resultados['gerar_excel_materiais'] = medir(
+            lambda _: app.gerar_excel_materiais(materiais_df), args.repeticoes
+        )
+
+        if not args.sem_telas:
+            resultados.update(medir_telas(diretorio, inventario_exemplo, args.repeticoes, args.timeout_tela))
+
+        return {
+            'materiais': quantidade_materiais,
+            'inventarios': quantidade_inventarios,
+            'itens_por_inventario': args.itens_por_inventario,
+            'resultados': resultados,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Relatório e comparação
+# ---------------------------------------------------------------------------
+
+def obter_commit() -> Optional[str]:
+    """Retorna o hash do commit atual, se disponível"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=DIRETORIO_APP, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def chave_cenario(cenario: Dict) -> str:
+    return f"{cenario['materiais']}m/{cenario['inventarios']}i/{cenario['itens_por_inventario']}ipi"
+
+
+def comparar(atual: Dict, anterior: Dict, tolerancia: float) -> List[str]:
+    """Compara duas execuções e retorna a lista de regressões acima da tolerância"""
+    cenarios_anteriores = {chave_cenario(c): c for c in anterior['cenarios']}
+    regressoes = []
+
+    for cenario in atual['cenarios']:
+        chave = chave_cenario(cenario)
+        base = cenarios_anteriores.get(chave)
+        if base is None:
+            continue
+
+        print(f"\n== {chave} ==")
+        for nome, medida in cenario['resultados'].items():
+            medida_base = base['resultados'].get(nome)
+            if not medida_base or 'mediana_s' not in medida or 'mediana_s' not in medida_base:
+                continue
+
+            razao = medida['mediana_s'] / medida_base['mediana_s'] if medida_base['mediana_s'] else float('inf')
+            marcador = ""
+            if razao > 1 + tolerancia:
+                marcador = "  <-- REGRESSÃO"
+                regressoes.append(f"{chave} {nome}: {razao:.2f}x")
+            print(f"{nome:32s} {medida_base['mediana_s']:10.4f}s -> {medida['mediana_s']:10.4f}s  ({razao:.2f}x){marcador}")
+
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do Sistema de Inventário")
+    parser.add_argument("--materiais", type=int, nargs="+", default=[10000],
+                        help="Tamanhos de catálogo (ex.: 10000 100000 1000000)")
+    parser.add_argument("--inventarios", type=int, nargs="+", default=[10],
+                        help="Quantidades de inventários no histórico (ex.: 10 1000 10000)")
+    parser.add_argument("--itens-por-inventario", type=int, default=50)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--sem-telas", action="store_true", help="Não mede o rerender das telas")
+    parser.add_argument("--timeout-tela", type=float, default=600.0,
+                        help="Tempo máximo (s) de cada execução de tela no AppTest")
+    parser.add_argument("--saida", default="benchmark_resultados.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Aumento relativo da mediana aceito antes de acusar regressão")
+    args = parser.parse_args(argv)
+
+    saida = os.path.abspath(args.saida)
+    comparar_com = os.path.abspath(args.comparar) if args.comparar else None
+
+    app = importar_app()
+
+    cenarios = []
+    for quantidade_materiais in args.materiais:
+        for quantidade_inventarios in args.inventarios:
+            print(f"Executando cenário: {quantidade_materiais} materiais, {quantidade_inventarios} inventários...")
+            cenarios.append(executar_cenario(app, quantidade_materiais, quantidade_inventarios, args))
+
+    resultado = {
+        'commit': obter_commit(),
+        'data_execucao': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cenarios': cenarios,
+    }
+
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {saida}")
+
+    if comparar_com:
+        with open(comparar_com, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        regressoes = comparar(resultado, anterior, args.tolerancia)
+        if regressoes:
+            print("\nRegressões encontradas:")
+            for regressao in regressoes:
+                print(f"  - {regressao}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
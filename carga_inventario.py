@@ -0,0 +1,402 @@
+"""
+Teste de carga do Sistema de Inventário.
+
+Simula vários contadores usando a aplicação ao mesmo tempo sobre um banco
+sintético, com uma mistura configurável de operações (adicionar itens,
+carregar relatórios e exportar Excel), e mede vazão, latências p50/p95/p99
+e erros de bloqueio do SQLite.
+
+Modos:
+    direto   cada usuário é uma thread com o próprio DatabaseManager, como as
+             sessões do servidor Streamlit (um processo, uma thread por sessão)
+    apptest  cada usuário é um processo que dirige a aplicação completa pelo
+             AppTest do Streamlit (rerender das telas incluído)
+
+Exemplos:
+    python carga_inventario.py --usuarios 20 --duracao 60
+    python carga_inventario.py --modo apptest --usuarios 8 --mix adicionar=80,relatorio=15,exportar=5
+"""
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmark_inventario import (
+    ARQUIVO_APP, OPCOES_TELA, gerar_catalogo, gerar_historico, importar_app, obter_commit
+)
+
+OPERACOES = ("adicionar", "relatorio", "exportar")
+# Preparação de cada usuário (criar o inventário, abrir a sessão): registrada à
+# parte e fora do total, para que um bloqueio nessa etapa também seja medido
+PREPARACAO = "preparacao"
+
+# Resultado de uma operação: (operação, latência em segundos, status)
+# status: "ok", "erro" ou "bloqueio" (database is locked / busy)
+Registro = Tuple[str, float, str]
+
+
+def interpretar_mix(texto: str) -> Dict[str, float]:
+    """Converte "adicionar=70,relatorio=20,exportar=10" em pesos por operação"""
+    mix = {}
+    for parte in texto.split(","):
+        nome, _, peso = parte.partition("=")
+        nome = nome.strip()
+        if nome not in OPERACOES:
+            raise argparse.ArgumentTypeError(f"Operação desconhecida: {nome} (use {', '.join(OPERACOES)})")
+        mix[nome] = float(peso)
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("O mix precisa de ao menos uma operação com peso positivo")
+    return mix
+
+
+def classificar_erro(mensagem: str) -> str:
+    mensagem = mensagem.lower()
+    return "bloqueio" if "locked" in mensagem or "busy" in mensagem else "erro"
+
+
+def preparar_usuario(registros: List[Registro], prazo: float, acao: Callable[[], Any]) -> Optional[Any]:
+    """Executa a preparação do usuário registrando cada tentativa. Bloqueios são
+    repetidos até o prazo; outros erros (ou o fim do prazo) encerram o usuário (None)."""
+    while time.perf_counter() < prazo:
+        inicio = time.perf_counter()
+        try:
+            resultado = acao()
+        except Exception as e:
+            status = classificar_erro(str(e))
+            registros.append((PREPARACAO, time.perf_counter() - inicio, status))
+            if status != "bloqueio":
+                return None
+        else:
+            registros.append((PREPARACAO, time.perf_counter() - inicio, "ok"))
+            return resultado
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Modo direto: threads sobre o DatabaseManager
+# ---------------------------------------------------------------------------
+
+# Mensagens de st.error da thread atual (os métodos do DatabaseManager tratam
+# as exceções e apenas exibem o erro)
+_erros_thread = threading.local()
+
+
+@contextlib.contextmanager
+def _capturar_st_error(app):
+    """Registra as mensagens de st.error por thread, mantendo a chamada original,
+    e restaura st.error ao sair"""
+    original = app.st.error
+
+    def error(mensagem, *args, **kwargs):
+        getattr(_erros_thread, "mensagens", []).append(str(mensagem))
+        return original(mensagem, *args, **kwargs)
+
+    app.st.error = error
+    try:
+        yield
+    finally:
+        app.st.error = original
+
+
+def usuario_direto(app, db_path: str, numero: int, mix: Dict[str, float], fim: float,
+                   codigos: List[str], inventarios_existentes: List[int], semente: int) -> List[Registro]:
+    """Simula um contador chamando o DatabaseManager diretamente"""
+    rng = random.Random(semente + numero)
+    registros = []
+
+    def criar_inventario():
+        db_manager = app.DatabaseManager(db_path)
+        return db_manager, db_manager.criar_inventario(f"Usuário {numero}")
+
+    preparado = preparar_usuario(registros, fim, criar_inventario)
+    if preparado is None:
+        return registros
+    db_manager, inventario_id = preparado
+
+    pendentes = rng.sample(codigos, len(codigos))
+    operacoes, pesos = list(mix), list(mix.values())
+
+    while time.perf_counter() < fim:
+        operacao = rng.choices(operacoes, pesos)[0]
+        _erros_thread.mensagens = []
+        inicio = time.perf_counter()
+        status = "ok"
+        try:
+            if operacao == "adicionar":
+                codigo = pendentes.pop() if pendentes else rng.choice(codigos)
+                if not db_manager.adicionar_item_inventario(inventario_id, codigo, rng.randint(0, 50)):
+                    status = "erro"
+            elif operacao == "relatorio":
+                inventarios_df = db_manager.obter_todos_inventarios()
+                db_manager.contar_materiais()
+                db_manager.obter_itens_inventario_pagina(rng.choice(inventarios_existentes), 1, 50)
+                if inventarios_df.empty:
+                    status = "erro"
+            else:
+                app.gerar_excel_inventario(rng.choice(inventarios_existentes + [inventario_id]), db_manager)
+        except sqlite3.OperationalError as e:
+            status = classificar_erro(str(e))
+        except Exception:
+            status = "erro"
+
+        latencia = time.perf_counter() - inicio
+        if status == "erro" and _erros_thread.mensagens:
+            status = classificar_erro(" ".join(_erros_thread.mensagens))
+        registros.append((operacao, latencia, status))
+
+    return registros
+
+
+def executar_direto(app, db_path: str, args: argparse.Namespace, codigos: List[str],
+                    inventarios_existentes: List[int]) -> Tuple[List[Registro], float]:
+    inicio = time.perf_counter()
+    fim = inicio + args.duracao
+
+    with _capturar_st_error(app), ThreadPoolExecutor(max_workers=args.usuarios) as executor:
+        futuros = [
+            executor.submit(usuario_direto, app, db_path, numero, args.mix, fim,
+                            codigos, inventarios_existentes, args.semente)
+            for numero in range(args.usuarios)
+        ]
+        registros = [registro for futuro in futuros for registro in futuro.result()]
+
+    return registros, time.perf_counter() - inicio
+
+
+# ---------------------------------------------------------------------------
+# Modo apptest: processos dirigindo a aplicação completa
+# ---------------------------------------------------------------------------
+
+def _clicar(at, rotulo: str):
+    for botao in at.button:
+        if botao.label == rotulo:
+            botao.click()
+            return
+    raise LookupError(f"Botão não encontrado: {rotulo}")
+
+
+def _mensagens_erro(at) -> List[str]:
+    mensagens = [str(excecao.message) for excecao in at.exception]
+    mensagens += [str(erro.value) for erro in at.error]
+    return mensagens
+
+
+def usuario_apptest(parametros: Tuple) -> List[Registro]:
+    """Simula um contador dirigindo as telas da aplicação pelo AppTest"""
+    diretorio, numero, mix, duracao, timeout, semente = parametros
+    from streamlit.testing.v1 import AppTest
+
+    # A aplicação abre "inventario.db" no diretório corrente
+    os.chdir(diretorio)
+    app = importar_app()
+    rng = random.Random(semente + numero)
+    registros = []
+
+    def abrir_sessao():
+        at = AppTest.from_file(ARQUIVO_APP, default_timeout=timeout)
+        at.run()
+        mensagens = _mensagens_erro(at)
+        if mensagens:
+            raise RuntimeError(" ".join(mensagens))
+        return at
+
+    # A preparação tem o mesmo prazo da carga
+    prazo = time.perf_counter() + duracao
+    inventario_id = preparar_usuario(
+        registros, prazo, lambda: app.DatabaseManager("inventario.db").criar_inventario(f"Usuário {numero}")
+    )
+    at = preparar_usuario(registros, prazo, abrir_sessao) if inventario_id is not None else None
+    if at is None:
+        return registros
+    at.session_state["inventario_ativo"] = inventario_id
+    at.session_state["itens_adicionados"] = []
+
+    operacoes, pesos = list(mix), list(mix.values())
+    # O prazo conta a partir do fim da preparação da sessão
+    fim = time.perf_counter() + duracao
+
+    while time.perf_counter() < fim:
+        operacao = rng.choices(operacoes, pesos)[0]
+        # A tela só gera o Excel de inventários com itens
+        if operacao == "exportar" and not at.session_state["itens_adicionados"]:
+            operacao = "adicionar"
+        tela = OPCOES_TELA["tela_relatorios" if operacao == "relatorio" else "tela_rotina_inventario"]
+        inicio = None
+
+        try:
+            # Navegação até a tela da operação não entra na medição
+            if operacao != "relatorio" and at.sidebar.selectbox[0].value != tela:
+                at.sidebar.selectbox[0].set_value(tela)
+                at.run()
+
+            if operacao == "adicionar":
+                seletor = at.selectbox(key="select_material")
+                seletor.set_value(rng.choice(seletor.options))
+                at.number_input(key="input_quantidade").set_value(rng.randint(0, 50))
+                _clicar(at, "➕ Adicionar ao Inventário")
+            elif operacao == "relatorio":
+                at.sidebar.selectbox[0].set_value(tela)
+            else:
+                _clicar(at, "📊 Gerar Excel")
+
+            inicio = time.perf_counter()
+            at.run()
+            latencia = time.perf_counter() - inicio
+
+            mensagens = _mensagens_erro(at)
+            status = classificar_erro(" ".join(mensagens)) if mensagens else "ok"
+        except Exception as e:
+            latencia = time.perf_counter() - inicio if inicio is not None else 0.0
+            status = classificar_erro(str(e))
+
+        registros.append((operacao, latencia, status))
+
+    return registros
+
+
+def executar_apptest(diretorio: str, args: argparse.Namespace) -> Tuple[List[Registro], float]:
+    contexto = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    inicio = time.perf_counter()
+    with contexto.Pool(processes=args.usuarios) as pool:
+        resultados = pool.map(
+            usuario_apptest,
+            [(diretorio, numero, args.mix, args.duracao, args.timeout_tela, args.semente)
+             for numero in range(args.usuarios)]
+        )
+
+    return [registro for registros in resultados for registro in registros], time.perf_counter() - inicio
+
+
+# ---------------------------------------------------------------------------
+# Relatório
+# ---------------------------------------------------------------------------
+
+def percentil(valores: List[float], p: float) -> Optional[float]:
+    """Percentil pelo método do posto mais próximo"""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    posto = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[posto - 1]
+
+
+def resumir(registros: List[Registro], duracao: float) -> Dict:
+    """Agrupa os registros por operação com vazão, latências e erros"""
+    grupos = {"total": [r for r in registros if r[0] != PREPARACAO]}
+    for operacao in (*OPERACOES, PREPARACAO):
+        selecionados = [r for r in registros if r[0] == operacao]
+        if selecionados:
+            grupos[operacao] = selecionados
+
+    resumo = {}
+    for nome, grupo in grupos.items():
+        latencias = [latencia for _, latencia, status in grupo if status == "ok"]
+        resumo[nome] = {
+            'operacoes': len(grupo),
+            'sucesso': len(latencias),
+            'erros': sum(1 for r in grupo if r[2] == "erro"),
+            'erros_bloqueio': sum(1 for r in grupo if r[2] == "bloqueio"),
+            'vazao_ops_s': len(latencias) / duracao if duracao else 0.0,
+            'p50_s': percentil(latencias, 50),
+            'p95_s': percentil(latencias, 95),
+            'p99_s': percentil(latencias, 99),
+        }
+    return resumo
+
+
+def imprimir_resumo(resumo: Dict):
+    print(f"\n{'operação':12s} {'ops':>7s} {'ok/s':>8s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'erros':>6s} {'bloqueios':>9s}")
+    for nome, dados in resumo.items():
+        latencias = [
+            f"{dados[chave] * 1000:7.1f}ms" if dados[chave] is not None else f"{'-':>9s}"
+            for chave in ('p50_s', 'p95_s', 'p99_s')
+        ]
+        print(f"{nome:12s} {dados['operacoes']:7d} {dados['vazao_ops_s']:8.2f} {' '.join(latencias)} "
+              f"{dados['erros']:6d} {dados['erros_bloqueio']:9d}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga do Sistema de Inventário")
+    parser.add_argument("--modo", choices=["direto", "apptest"], default="direto")
+    parser.add_argument("--usuarios", type=int, default=10, help="Contadores simultâneos")
+    parser.add_argument("--duracao", type=float, default=30.0, help="Duração da carga em segundos")
+    parser.add_argument("--mix", type=interpretar_mix, default=interpretar_mix("adicionar=70,relatorio=20,exportar=10"),
+                        help="Pesos das operações, ex.: adicionar=70,relatorio=20,exportar=10")
+    parser.add_argument("--materiais", type=int, default=10000)
+    parser.add_argument("--inventarios", type=int, default=100)
+    parser.add_argument("--itens-por-inventario", type=int, default=50)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--timeout-tela", type=float, default=120.0,
+                        help="Tempo máximo (s) de cada execução de tela no modo apptest")
+    parser.add_argument("--saida", default="carga_resultados.json")
+    args = parser.parse_args(argv)
+
+    saida = os.path.abspath(args.saida)
+    app = importar_app()
+
+    with tempfile.TemporaryDirectory(prefix="carga_inventario_") as diretorio:
+        db_path = os.path.join(diretorio, "inventario.db")
+        materiais = gerar_catalogo(args.materiais, args.semente)
+        codigos = [m['codigo'] for m in materiais]
+
+        print(f"Preparando banco: {args.materiais} materiais, {args.inventarios} inventários...")
+        db_manager = app.DatabaseManager(db_path)
+        db_manager.inserir_materiais(materiais)
+        inventarios_existentes = gerar_historico(
+            db_path, codigos, args.inventarios, args.itens_por_inventario, args.semente
+        )
+        # A manutenção agendada roda antes da carga para não distorcer a medição
+        db_manager.executar_manutencao_agendada()
+
+        print(f"Executando carga ({args.modo}): {args.usuarios} usuários por {args.duracao:.0f}s...")
+        if args.modo == "direto":
+            registros, duracao = executar_direto(app, db_path, args, codigos, inventarios_existentes)
+        else:
+            registros, duracao = executar_apptest(diretorio, args)
+
+    # Vazão sobre a janela de carga; a preparação das sessões fica de fora
+    resumo = resumir(registros, args.duracao)
+    imprimir_resumo(resumo)
+
+    resultado = {
+        'commit': obter_commit(),
+        'data_execucao': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'parametros': {
+            'modo': args.modo,
+            'usuarios': args.usuarios,
+            'duracao_s': args.duracao,
+            'mix': args.mix,
+            'materiais': args.materiais,
+            'inventarios': args.inventarios,
+            'itens_por_inventario': args.itens_por_inventario,
+        },
+        'duracao_real_s': duracao,
+        'resumo': resumo,
+    }
+
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {saida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Geração das planilhas Excel de inventário.
+
+Este módulo não usa Streamlit nem o banco de dados e não tem efeitos na
+importação, para que as planilhas possam ser montadas em processos separados
+durante a exportação em lote.
+"""
+import io
+from datetime import datetime
+from typing import Dict, Tuple
+
+import pandas as pd
+
+
+def montar_excel_inventario(info: Dict, itens: pd.DataFrame) -> io.BytesIO:
+    """Monta o arquivo Excel de um inventário a partir das informações e dos itens"""
+    # Formatar data para padrão brasileiro
+    data_formatada = datetime.fromisoformat(info['data_inventario']).strftime('%d/%m/%Y %H:%M')
+
+    # Criar arquivo Excel
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        # Aba com os itens
+        if not itens.empty:
+            # Renomear colunas para português
+            itens_export = itens.copy()
+            itens_export.columns = ['Código do Material', 'Descrição', 'Quantidade']
+            itens_export.to_excel(writer, sheet_name='Itens do Inventário', index=False)
+        else:
+            # Criar aba vazia se não houver itens
+            pd.DataFrame(columns=['Código do Material', 'Descrição', 'Quantidade']).to_excel(
+                writer, sheet_name='Itens do Inventário', index=False
+            )
+
+        # Aba com informações gerais
+        info_df = pd.DataFrame({
+            'Empresa': ['Rezende Energia'],
+            'Responsável': [info['responsavel']],
+            'Data do Inventário': [data_formatada],
+            'Total de Itens Diferentes': [len(itens)],
+            'Quantidade Total': [itens['quantidade'].sum() if not itens.empty else 0]
+        })
+        info_df.to_excel(writer, sheet_name='Informações Gerais', index=False)
+
+        # Aba com resumo por código (se houver itens)
+        if not itens.empty:
+            resumo_df = itens.groupby('codigo_material').agg({
+                'descricao': 'first',
+                'quantidade': 'sum'
+            }).reset_index()
+            resumo_df.columns = ['Código do Material', 'Descrição', 'Quantidade Total']
+            resumo_df.to_excel(writer, sheet_name='Resumo por Código', index=False)
+
+    buffer.seek(0)
+    return buffer
+
+
+def gerar_planilha_exportacao(nome_arquivo: str, info: Dict, itens: pd.DataFrame) -> Tuple[str, bytes]:
+    """Tarefa dos processos de exportação em lote: retorna o nome e o conteúdo da planilha"""
+    return nome_arquivo, montar_excel_inventario(info, itens).getvalue()
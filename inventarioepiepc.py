@@ -1,9 +1,21 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from functools import partial
+import hashlib
 import io
-from typing import List, Dict, Optional
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from typing import BinaryIO, Callable, List, Dict, Optional, Tuple
+
+from excel_inventario import gerar_planilha_exportacao, montar_excel_inventario
 
 # Configuração da página
 st.set_page_config(
@@ -190,6 +202,16 @@ st.markdown("""
 class DatabaseManager:
     """Gerenciador do banco de dados SQLite"""
 
+    # Inventários finalizados mais antigos que isso vão para o arquivo morto
+    DIAS_PARA_ARQUIVAMENTO = 365
+    # Intervalo entre as manutenções automáticas (arquivamento, ANALYZE, vacuum)
+    INTERVALO_MANUTENCAO_DIAS = 7
+    # Horas (início, fim) em que a manutenção automática pode rodar, fora do horário
+    # de contagem; a janela pode passar da meia-noite
+    JANELA_MANUTENCAO = (22, 6)
+    # Intervalo (segundos) entre as verificações da manutenção em segundo plano
+    VERIFICACAO_MANUTENCAO_SEGUNDOS = 15 * 60
+
     def __init__(self, db_path: str = "inventario.db"):
         self.db_path = db_path
         self.init_database()
@@ -199,6 +221,9 @@ class DatabaseManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
+        # Só tem efeito em bancos novos; bancos existentes são convertidos na manutenção
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
         # Tabela de materiais
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS materiais (
@@ -229,20 +254,158 @@ class DatabaseManager:
             )
         """)
 
+        # Inventários finalizados podem ser arquivados (bancos antigos não tinham a coluna)
+        if self._adicionar_coluna(cursor, 'inventarios', 'finalizado', "INTEGER NOT NULL DEFAULT 0"):
+            # Inventários anteriores à coluna são considerados encerrados
+            cursor.execute("UPDATE inventarios SET finalizado = 1")
+
+        # Versões do catálogo: cada importação que altera descrições gera uma versão
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS catalogo_versoes (
+                versao INTEGER PRIMARY KEY AUTOINCREMENT,
+                data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                total_alteracoes INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Histórico copy-on-write: uma linha só quando o código é novo ou a descrição muda
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS materiais_historico (
+                codigo TEXT NOT NULL,
+                versao INTEGER NOT NULL,
+                descricao TEXT NOT NULL,
+                PRIMARY KEY (codigo, versao)
+            ) WITHOUT ROWID
+        """)
+
+        # Cada inventário fixa a versão do catálogo vigente na sua criação e cada item a
+        # vigente quando foi contado (itens anteriores à coluna ficam sem versão)
+        self._adicionar_coluna(cursor, 'inventarios', 'versao_catalogo', "INTEGER")
+        self._adicionar_coluna(cursor, 'inventario_itens', 'versao_catalogo', "INTEGER")
+
+        # Resumo dos inventários movidos para os bancos de arquivo morto
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS inventarios_arquivados (
+                id INTEGER PRIMARY KEY,
+                ano INTEGER NOT NULL,
+                responsavel TEXT NOT NULL,
+                data_inventario DATETIME,
+                total_itens INTEGER NOT NULL,
+                quantidade_total INTEGER
+            )
+        """)
+        self._adicionar_coluna(cursor, 'inventarios_arquivados', 'versao_catalogo', "INTEGER")
+
+        # Controle da manutenção automática
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS manutencao (
+                tarefa TEXT PRIMARY KEY,
+                ultima_execucao DATETIME,
+                inicio_execucao DATETIME
+            )
+        """)
+
+        # Índices para as consultas paginadas e filtradas
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_inventario_itens_inventario
+            ON inventario_itens (inventario_id, codigo_material)
+        """)
+        # Filtros usam LIKE '%x%' e não aproveitam índice; este serve à ordenação por descrição
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_materiais_descricao
+            ON materiais (descricao)
+        """)
+
+        # Bancos anteriores ao versionamento: o catálogo atual vira a versão inicial
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM materiais_historico)")
+        historico_vazio = not cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM materiais")
+        total_materiais = cursor.fetchone()[0]
+        if historico_vazio and total_materiais:
+            cursor.execute(
+                "INSERT INTO catalogo_versoes (total_alteracoes) VALUES (?)", (total_materiais,)
+            )
+            versao_inicial = cursor.lastrowid
+            cursor.execute("""
+                INSERT INTO materiais_historico (codigo, versao, descricao)
+                SELECT codigo, ?, descricao FROM materiais
+            """, (versao_inicial,))
+            cursor.execute("""
+                UPDATE inventarios SET versao_catalogo = ? WHERE versao_catalogo IS NULL
+            """, (versao_inicial,))
+            cursor.execute("""
+                UPDATE inventarios_arquivados SET versao_catalogo = ? WHERE versao_catalogo IS NULL
+            """, (versao_inicial,))
+
         conn.commit()
         conn.close()
 
+    @staticmethod
+    def _adicionar_coluna(cursor: sqlite3.Cursor, tabela: str, coluna: str, definicao: str,
+                          esquema: str = "main") -> bool:
+        """Adiciona a coluna se ela ainda não existir. Retorna True se foi criada."""
+        colunas = [col[1] for col in cursor.execute(f"PRAGMA {esquema}.table_info({tabela})")]
+        if coluna in colunas:
+            return False
+        cursor.execute(f"ALTER TABLE {esquema}.{tabela} ADD COLUMN {coluna} {definicao}")
+        return True
+
+    @staticmethod
+    def _montar_filtros(filtros: Optional[Dict[str, str]], colunas: Dict[str, str]) -> Tuple[List[str], list]:
+        """Monta as condições WHERE (LIKE) para os filtros de coluna permitidos"""
+        condicoes = []
+        params = []
+        for coluna, valor in (filtros or {}).items():
+            if coluna in colunas and valor and valor.strip():
+                condicoes.append(f"{colunas[coluna]} LIKE ?")
+                params.append(f"%{valor.strip()}%")
+        return condicoes, params
+
+    @staticmethod
+    def _montar_ordenacao(ordenar_por: str, decrescente: bool, colunas: Dict[str, str], padrao: str) -> str:
+        """Monta a cláusula ORDER BY apenas com colunas permitidas"""
+        coluna = colunas.get(ordenar_por, colunas[padrao])
+        direcao = "DESC" if decrescente else "ASC"
+        # Desempate pela chave para manter a paginação estável
+        return f"ORDER BY {coluna} {direcao}, {colunas[padrao]} {direcao}"
+
     def inserir_materiais(self, materiais: List[Dict[str, str]]) -> bool:
-        """Insere materiais no banco de dados"""
+        """Insere materiais no banco de dados, registrando uma nova versão do catálogo"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            for material in materiais:
+            cursor.execute("INSERT INTO catalogo_versoes DEFAULT VALUES")
+            versao = cursor.lastrowid
+            total_alteracoes = 0
+
+            # Códigos repetidos na planilha contam uma vez (vale a última descrição)
+            descricoes = {material['codigo']: material['descricao'] for material in materiais}
+
+            for codigo, descricao in descricoes.items():
+                # Guarda no histórico apenas códigos novos ou descrições alteradas
+                cursor.execute("""
+                    INSERT OR REPLACE INTO materiais_historico (codigo, versao, descricao)
+                    SELECT ?, ?, ?
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM materiais WHERE codigo = ? AND descricao = ?
+                    )
+                """, (codigo, versao, descricao, codigo, descricao))
+                total_alteracoes += cursor.rowcount
+
                 cursor.execute("""
                     INSERT OR REPLACE INTO materiais (codigo, descricao)
                     VALUES (?, ?)
-                """, (material['codigo'], material['descricao']))
+                """, (codigo, descricao))
+
+            if total_alteracoes:
+                cursor.execute(
+                    "UPDATE catalogo_versoes SET total_alteracoes = ? WHERE versao = ?",
+                    (total_alteracoes, versao)
+                )
+            else:
+                # Importação sem alterações não gera versão nova
+                cursor.execute("DELETE FROM catalogo_versoes WHERE versao = ?", (versao,))
 
             conn.commit()
             conn.close()
@@ -258,14 +421,54 @@ class DatabaseManager:
         conn.close()
         return df
 
+    COLUNAS_MATERIAIS = {
+        'codigo': 'codigo',
+        'descricao': 'descricao',
+        'data_cadastro': 'data_cadastro',
+    }
+
+    def contar_materiais(self, filtros: Optional[Dict[str, str]] = None) -> int:
+        """Conta os materiais cadastrados que atendem aos filtros"""
+        condicoes, params = self._montar_filtros(filtros, self.COLUNAS_MATERIAIS)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM materiais {where}", params)
+        total = cursor.fetchone()[0]
+        conn.close()
+        return total
+
+    def obter_materiais_pagina(self, pagina: int, tamanho_pagina: int,
+                               filtros: Optional[Dict[str, str]] = None,
+                               ordenar_por: str = 'codigo', decrescente: bool = False) -> pd.DataFrame:
+        """Obtém apenas uma página dos materiais cadastrados (filtro e ordenação no SQL)"""
+        condicoes, params = self._montar_filtros(filtros, self.COLUNAS_MATERIAIS)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        ordem = self._montar_ordenacao(ordenar_por, decrescente, self.COLUNAS_MATERIAIS, 'codigo')
+
+        conn = sqlite3.connect(self.db_path)
+        query = f"""
+            SELECT codigo, descricao, data_cadastro
+            FROM materiais
+            {where}
+            {ordem}
+            LIMIT ? OFFSET ?
+        """
+        df = pd.read_sql_query(
+            query, conn, params=(*params, tamanho_pagina, max(pagina - 1, 0) * tamanho_pagina)
+        )
+        conn.close()
+        return df
+
     def criar_inventario(self, responsavel: str) -> int:
         """Cria um novo inventário e retorna o ID"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
-            INSERT INTO inventarios (responsavel, data_inventario)
-            VALUES (?, ?)
+            INSERT INTO inventarios (responsavel, data_inventario, versao_catalogo)
+            VALUES (?, ?, (SELECT MAX(versao) FROM catalogo_versoes))
         """, (responsavel, datetime.now()))
 
         inventario_id = cursor.lastrowid
@@ -280,8 +483,8 @@ class DatabaseManager:
             cursor = conn.cursor()
 
             cursor.execute("""
-                INSERT INTO inventario_itens (inventario_id, codigo_material, quantidade)
-                VALUES (?, ?, ?)
+                INSERT INTO inventario_itens (inventario_id, codigo_material, quantidade, versao_catalogo)
+                VALUES (?, ?, ?, (SELECT MAX(versao) FROM catalogo_versoes))
             """, (inventario_id, codigo_material, quantidade))
 
             conn.commit()
@@ -291,20 +494,117 @@ class DatabaseManager:
             st.error(f"Erro ao adicionar item: {str(e)}")
             return False
 
+    def finalizar_inventario(self, inventario_id: int):
+        """Marca o inventário como finalizado, liberando-o para arquivamento"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE inventarios SET finalizado = 1 WHERE id = ?", (inventario_id,))
+        conn.commit()
+        conn.close()
+
+    def caminho_arquivo(self, ano: int) -> str:
+        """Caminho do banco de arquivo morto de um ano"""
+        return f"{os.path.splitext(self.db_path)[0]}_arquivo_{ano}.db"
+
+    def _conectar_inventario(self, inventario_id: int) -> Tuple[sqlite3.Connection, str, Optional[int]]:
+        """Abre a conexão e anexa o arquivo morto se o inventário estiver arquivado.
+        Retorna a conexão, o esquema que contém os itens e a versão do catálogo do inventário."""
+        conn = sqlite3.connect(self.db_path)
+        ano, versao = conn.execute("""
+            SELECT NULL, versao_catalogo FROM inventarios WHERE id = ?
+            UNION ALL
+            SELECT ano, versao_catalogo FROM inventarios_arquivados WHERE id = ?
+        """, (inventario_id, inventario_id)).fetchone() or (None, None)
+
+        if ano is None:
+            return conn, "main", versao
+
+        conn.execute("ATTACH DATABASE ? AS arquivo", (self.caminho_arquivo(ano),))
+        return conn, "arquivo", versao
+
+    @staticmethod
+    def _consulta_itens(esquema: str) -> str:
+        """Itens de um inventário com a descrição resolvida na versão do catálogo do item.
+        Parâmetros: versão do catálogo do inventário e ID do inventário. Itens sem
+        versão (anteriores ao versionamento por item) usam a versão do inventário e,
+        fora do histórico, a descrição atual."""
+        return f"""
+            WITH itens AS (
+                SELECT 
+                    ii.id,
+                    ii.codigo_material,
+                    COALESCE(
+                        (SELECT h.descricao
+                         FROM materiais_historico h
+                         WHERE h.codigo = ii.codigo_material
+                           AND h.versao <= COALESCE(ii.versao_catalogo, ?1)
+                         ORDER BY h.versao DESC
+                         LIMIT 1),
+                        CASE WHEN ii.versao_catalogo IS NULL THEN m.descricao END
+                    ) as descricao,
+                    ii.quantidade
+                FROM {esquema}.inventario_itens ii
+                LEFT JOIN materiais m ON ii.codigo_material = m.codigo
+                WHERE ii.inventario_id = ?2
+            )
+        """
+
     def obter_itens_inventario(self, inventario_id: int) -> pd.DataFrame:
         """Obtém os itens de um inventário"""
-        conn = sqlite3.connect(self.db_path)
-        query = """
-            SELECT 
-                ii.codigo_material,
-                m.descricao,
-                ii.quantidade
-            FROM inventario_itens ii
-            JOIN materiais m ON ii.codigo_material = m.codigo
-            WHERE ii.inventario_id = ?
-            ORDER BY ii.codigo_material
+        conn, esquema, versao = self._conectar_inventario(inventario_id)
+        query = f"""
+            {self._consulta_itens(esquema)}
+            SELECT codigo_material, descricao, quantidade
+            FROM itens
+            ORDER BY codigo_material
         """
-        df = pd.read_sql_query(query, conn, params=(inventario_id,))
+        df = pd.read_sql_query(query, conn, params=(versao, inventario_id))
+        conn.close()
+        return df
+
+    COLUNAS_ITENS = {
+        'codigo_material': 'codigo_material',
+        'descricao': 'descricao',
+        'quantidade': 'quantidade',
+    }
+
+    def contar_itens_inventario(self, inventario_id: int, filtros: Optional[Dict[str, str]] = None) -> int:
+        """Conta os itens de um inventário que atendem aos filtros"""
+        condicoes, params = self._montar_filtros(filtros, self.COLUNAS_ITENS)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        conn, esquema, versao = self._conectar_inventario(inventario_id)
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            {self._consulta_itens(esquema)}
+            SELECT COUNT(*) FROM itens
+            {where}
+        """, (versao, inventario_id, *params))
+        total = cursor.fetchone()[0]
+        conn.close()
+        return total
+
+    def obter_itens_inventario_pagina(self, inventario_id: int, pagina: int, tamanho_pagina: int,
+                                      filtros: Optional[Dict[str, str]] = None,
+                                      ordenar_por: str = 'codigo_material',
+                                      decrescente: bool = False) -> pd.DataFrame:
+        """Obtém apenas uma página dos itens de um inventário (filtro e ordenação no SQL)"""
+        condicoes, params = self._montar_filtros(filtros, self.COLUNAS_ITENS)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        ordem = self._montar_ordenacao(ordenar_por, decrescente, self.COLUNAS_ITENS, 'codigo_material')
+
+        conn, esquema, versao = self._conectar_inventario(inventario_id)
+        query = f"""
+            {self._consulta_itens(esquema)}
+            SELECT codigo_material, descricao, quantidade
+            FROM itens
+            {where}
+            {ordem}
+            LIMIT ? OFFSET ?
+        """
+        df = pd.read_sql_query(
+            query, conn,
+            params=(versao, inventario_id, *params, tamanho_pagina, max(pagina - 1, 0) * tamanho_pagina)
+        )
         conn.close()
         return df
 
@@ -317,7 +617,11 @@ class DatabaseManager:
             SELECT responsavel, data_inventario
             FROM inventarios
             WHERE id = ?
-        """, (inventario_id,))
+            UNION ALL
+            SELECT responsavel, data_inventario
+            FROM inventarios_arquivados
+            WHERE id = ?
+        """, (inventario_id, inventario_id))
 
         result = cursor.fetchone()
         conn.close()
@@ -332,24 +636,35 @@ class DatabaseManager:
     def obter_todos_inventarios(self) -> pd.DataFrame:
         """Obtém todos os inventários realizados"""
         conn = sqlite3.connect(self.db_path)
+        # Inventários arquivados entram pelo resumo, sem abrir os bancos de arquivo morto
         query = """
             SELECT 
                 i.id,
                 i.responsavel,
                 i.data_inventario,
                 COUNT(ii.id) as total_itens,
-                SUM(ii.quantidade) as quantidade_total
+                SUM(ii.quantidade) as quantidade_total,
+                0 as arquivado
             FROM inventarios i
             LEFT JOIN inventario_itens ii ON i.id = ii.inventario_id
             GROUP BY i.id, i.responsavel, i.data_inventario
-            ORDER BY i.data_inventario DESC
+            UNION ALL
+            SELECT 
+                id,
+                responsavel,
+                data_inventario,
+                total_itens,
+                quantidade_total,
+                1 as arquivado
+            FROM inventarios_arquivados
+            ORDER BY data_inventario DESC
         """
         df = pd.read_sql_query(query, conn)
         conn.close()
 
         if not df.empty:
             # Formatar data para padrão brasileiro
-            df['data_formatada'] = pd.to_datetime(df['data_inventario']).dt.strftime('%d/%m/%Y')
+            df['data_formatada'] = pd.to_datetime(df['data_inventario'], format='ISO8601').dt.strftime('%d/%m/%Y')
             # Criar nome do inventário no formato solicitado
             df['nome_inventario'] = df.apply(
                 lambda row: f"Inventário Rezende Energia - {row['responsavel']} - {row['data_formatada']}",
@@ -358,6 +673,250 @@ class DatabaseManager:
 
         return df
 
+    def obter_inventarios_periodo(self, data_inicio: Optional[datetime] = None,
+                                  data_fim: Optional[datetime] = None,
+                                  responsavel: str = "") -> pd.DataFrame:
+        """Obtém os inventários (ativos e arquivados) de um período e/ou responsável"""
+        condicoes = []
+        params = []
+        if data_inicio is not None:
+            condicoes.append("data_inventario >= ?")
+            params.append(data_inicio)
+        if data_fim is not None:
+            condicoes.append("data_inventario < ?")
+            params.append(data_fim)
+        if responsavel and responsavel.strip():
+            condicoes.append("responsavel LIKE ?")
+            params.append(f"%{responsavel.strip()}%")
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        conn = sqlite3.connect(self.db_path)
+        # ultimo_item_id identifica alterações; inventários arquivados não mudam mais
+        query = f"""
+            SELECT 
+                i.id,
+                i.responsavel,
+                i.data_inventario,
+                COUNT(ii.id) as total_itens,
+                SUM(ii.quantidade) as quantidade_total,
+                MAX(ii.id) as ultimo_item_id,
+                i.versao_catalogo
+            FROM inventarios i
+            LEFT JOIN inventario_itens ii ON i.id = ii.inventario_id
+            {where}
+            GROUP BY i.id, i.responsavel, i.data_inventario, i.versao_catalogo
+            UNION ALL
+            SELECT 
+                id,
+                responsavel,
+                data_inventario,
+                total_itens,
+                quantidade_total,
+                NULL as ultimo_item_id,
+                versao_catalogo
+            FROM inventarios_arquivados
+            {where}
+            ORDER BY data_inventario
+        """
+        df = pd.read_sql_query(query, conn, params=(*params, *params))
+        conn.close()
+
+        if not df.empty:
+            df['data_formatada'] = pd.to_datetime(df['data_inventario'], format='ISO8601').dt.strftime('%d/%m/%Y')
+
+        return df
+
+    def assinatura_catalogo(self) -> str:
+        """Identifica o estado atual do catálogo de materiais"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(data_cadastro) FROM materiais")
+        total, ultima_alteracao = cursor.fetchone()
+        conn.close()
+        return f"{total}|{ultima_alteracao}"
+
+    def arquivar_inventarios(self, data_corte: datetime) -> Optional[int]:
+        """Move inventários finalizados anteriores à data de corte para os bancos
+        de arquivo morto (um por ano) e retorna a quantidade arquivada (None em caso de erro)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT DISTINCT CAST(strftime('%Y', data_inventario) AS INTEGER)
+                FROM inventarios
+                WHERE finalizado = 1 AND data_inventario < ?
+            """, (data_corte,))
+            anos = [row[0] for row in cursor.fetchall()]
+
+            total_arquivado = 0
+            for ano in anos:
+                cursor.execute("ATTACH DATABASE ? AS arquivo", (self.caminho_arquivo(ano),))
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS arquivo.inventarios (
+                        id INTEGER PRIMARY KEY,
+                        responsavel TEXT NOT NULL,
+                        data_inventario DATETIME,
+                        finalizado INTEGER NOT NULL DEFAULT 1,
+                        versao_catalogo INTEGER
+                    )
+                """)
+                self._adicionar_coluna(cursor, 'inventarios', 'versao_catalogo', "INTEGER", esquema="arquivo")
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS arquivo.inventario_itens (
+                        id INTEGER PRIMARY KEY,
+                        inventario_id INTEGER,
+                        codigo_material TEXT,
+                        quantidade INTEGER NOT NULL,
+                        versao_catalogo INTEGER
+                    )
+                """)
+                self._adicionar_coluna(cursor, 'inventario_itens', 'versao_catalogo', "INTEGER",
+                                       esquema="arquivo")
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS arquivo.idx_inventario_itens_inventario
+                    ON inventario_itens (inventario_id, codigo_material)
+                """)
+                cursor.execute("""
+                    CREATE TEMP TABLE ids_arquivamento AS
+                    SELECT id FROM main.inventarios
+                    WHERE finalizado = 1 AND data_inventario < ?
+                      AND CAST(strftime('%Y', data_inventario) AS INTEGER) = ?
+                """, (data_corte, ano))
+
+                # Cópia, resumo e remoção na mesma transação; um ID que já esteja
+                # no arquivo (arquivamento repetido) tem a cópia substituída
+                cursor.execute("""
+                    INSERT OR REPLACE INTO arquivo.inventarios
+                        (id, responsavel, data_inventario, finalizado, versao_catalogo)
+                    SELECT id, responsavel, data_inventario, finalizado, versao_catalogo
+                    FROM main.inventarios
+                    WHERE id IN (SELECT id FROM ids_arquivamento)
+                """)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO arquivo.inventario_itens
+                        (id, inventario_id, codigo_material, quantidade, versao_catalogo)
+                    SELECT id, inventario_id, codigo_material, quantidade, versao_catalogo
+                    FROM main.inventario_itens
+                    WHERE inventario_id IN (SELECT id FROM ids_arquivamento)
+                """)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO main.inventarios_arquivados
+                        (id, ano, responsavel, data_inventario, total_itens, quantidade_total, versao_catalogo)
+                    SELECT i.id, ?, i.responsavel, i.data_inventario, COUNT(ii.id), SUM(ii.quantidade),
+                           i.versao_catalogo
+                    FROM main.inventarios i
+                    LEFT JOIN main.inventario_itens ii ON i.id = ii.inventario_id
+                    WHERE i.id IN (SELECT id FROM ids_arquivamento)
+                    GROUP BY i.id, i.responsavel, i.data_inventario, i.versao_catalogo
+                """, (ano,))
+                cursor.execute("""
+                    DELETE FROM main.inventario_itens
+                    WHERE inventario_id IN (SELECT id FROM ids_arquivamento)
+                """)
+                cursor.execute("""
+                    DELETE FROM main.inventarios
+                    WHERE id IN (SELECT id FROM ids_arquivamento)
+                """)
+                total_arquivado += cursor.rowcount
+                conn.commit()
+
+                cursor.execute("DROP TABLE ids_arquivamento")
+                cursor.execute("DETACH DATABASE arquivo")
+
+            return total_arquivado
+        except Exception as e:
+            conn.rollback()
+            st.error(f"Erro ao arquivar inventários: {str(e)}")
+            return None
+        finally:
+            # Fechar a conexão também descarta a tabela temporária e o banco anexado
+            conn.close()
+
+    def manutencao_banco(self, converter_vacuum: bool = False) -> bool:
+        """Executa vacuum incremental, ANALYZE e PRAGMA optimize.
+
+        Bancos criados antes do vacuum incremental só são convertidos (VACUUM
+        completo, com o banco bloqueado) quando converter_vacuum=True, o que
+        acontece apenas na manutenção manual."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        cursor = conn.cursor()
+        try:
+            auto_vacuum = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if auto_vacuum == 2:
+                cursor.execute("PRAGMA incremental_vacuum")
+            elif converter_vacuum:
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                cursor.execute("VACUUM")
+
+            cursor.execute("ANALYZE")
+            cursor.execute("PRAGMA optimize")
+            return True
+        except Exception as e:
+            st.error(f"Erro na manutenção do banco de dados: {str(e)}")
+            return False
+        finally:
+            conn.close()
+
+    @classmethod
+    def em_janela_manutencao(cls, momento: Optional[datetime] = None) -> bool:
+        """Indica se o momento (agora, se None) está na janela da manutenção automática"""
+        inicio, fim = cls.JANELA_MANUTENCAO
+        hora = (momento or datetime.now()).hour
+        if inicio <= fim:
+            return inicio <= hora < fim
+        return hora >= inicio or hora < fim
+
+    def executar_manutencao_agendada(self, intervalo_dias: Optional[int] = None,
+                                     dias_arquivamento: Optional[int] = None) -> bool:
+        """Arquiva inventários antigos e otimiza o banco se a última manutenção
+        for mais antiga que o intervalo. Retorna True se a manutenção rodou com sucesso.
+        A data da última execução só avança após o sucesso; se algo falhar, a
+        próxima verificação tenta de novo."""
+        intervalo_dias = self.INTERVALO_MANUTENCAO_DIAS if intervalo_dias is None else intervalo_dias
+        dias_arquivamento = self.DIAS_PARA_ARQUIVAMENTO if dias_arquivamento is None else dias_arquivamento
+        agora = datetime.now()
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        try:
+            # Reserva a execução de forma atômica para que só uma sessão faça a manutenção;
+            # uma reserva com mais de uma hora é considerada abandonada
+            cursor.execute("""
+                INSERT OR IGNORE INTO manutencao (tarefa, ultima_execucao, inicio_execucao)
+                VALUES ('geral', NULL, NULL)
+            """)
+            cursor.execute("""
+                UPDATE manutencao SET inicio_execucao = ?
+                WHERE tarefa = 'geral'
+                  AND (ultima_execucao IS NULL OR ultima_execucao < ?)
+                  AND (inicio_execucao IS NULL OR inicio_execucao < ?)
+            """, (agora, agora - timedelta(days=intervalo_dias), agora - timedelta(hours=1)))
+            devida = cursor.rowcount == 1
+            conn.commit()
+
+            if not devida:
+                return False
+
+            sucesso = (
+                self.arquivar_inventarios(agora - timedelta(days=dias_arquivamento)) is not None
+                and self.manutencao_banco()
+            )
+
+            # Libera a reserva e registra a execução apenas se tudo deu certo
+            cursor.execute("""
+                UPDATE manutencao
+                SET inicio_execucao = NULL,
+                    ultima_execucao = CASE WHEN ? THEN ? ELSE ultima_execucao END
+                WHERE tarefa = 'geral'
+            """, (sucesso, agora))
+            conn.commit()
+            return sucesso
+        except Exception as e:
+            st.error(f"Erro na manutenção do banco de dados: {str(e)}")
+            return False
+        finally:
+            conn.close()
+
 
 def processar_excel_materiais(arquivo_excel) -> Optional[List[Dict[str, str]]]:
     """Processa o arquivo Excel de materiais"""
@@ -392,56 +951,231 @@ def gerar_excel_inventario(inventario_id: int, db_manager: DatabaseManager) -> i
     info = db_manager.obter_inventario_info(inventario_id)
     itens = db_manager.obter_itens_inventario(inventario_id)
 
-    # Formatar data para padrão brasileiro
-    data_formatada = datetime.fromisoformat(info['data_inventario']).strftime('%d/%m/%Y %H:%M')
+    return montar_excel_inventario(info, itens)
+
 
-    # Criar arquivo Excel
+def gerar_excel_materiais(materiais_df: pd.DataFrame) -> io.BytesIO:
+    """Gera arquivo Excel com a lista de materiais cadastrados"""
     buffer = io.BytesIO()
     with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        # Aba com os itens
-        if not itens.empty:
-            # Renomear colunas para português
-            itens_export = itens.copy()
-            itens_export.columns = ['Código do Material', 'Descrição', 'Quantidade']
-            itens_export.to_excel(writer, sheet_name='Itens do Inventário', index=False)
-        else:
-            # Criar aba vazia se não houver itens
-            pd.DataFrame(columns=['Código do Material', 'Descrição', 'Quantidade']).to_excel(
-                writer, sheet_name='Itens do Inventário', index=False
-            )
-
-        # Aba com informações gerais
-        info_df = pd.DataFrame({
-            'Empresa': ['Rezende Energia'],
-            'Responsável': [info['responsavel']],
-            'Data do Inventário': [data_formatada],
-            'Total de Itens Diferentes': [len(itens)],
-            'Quantidade Total': [itens['quantidade'].sum() if not itens.empty else 0]
-        })
-        info_df.to_excel(writer, sheet_name='Informações Gerais', index=False)
-
-        # Aba com resumo por código (se houver itens)
-        if not itens.empty:
-            resumo_df = itens.groupby('codigo_material').agg({
-                'descricao': 'first',
-                'quantidade': 'sum'
-            }).reset_index()
-            resumo_df.columns = ['Código do Material', 'Descrição', 'Quantidade Total']
-            resumo_df.to_excel(writer, sheet_name='Resumo por Código', index=False)
+        materiais_df.to_excel(writer, sheet_name='Materiais Cadastrados', index=False)
 
     buffer.seek(0)
     return buffer
 
 
-# Inicializar o gerenciador de banco de dados
-if 'db_manager' not in st.session_state:
-    st.session_state.db_manager = DatabaseManager()
+def nome_arquivo_inventario(responsavel: str, data_formatada: str) -> str:
+    """Nome do arquivo Excel de um inventário"""
+    return f"inventario_rezende_energia_{responsavel.replace(' ', '_')}_{data_formatada.replace('/', '')}.xlsx"
+
+
+# Diretório (ao lado do banco) do cache de exportações em lote
+DIRETORIO_EXPORTACOES = "exportacoes"
+# Limites do cache: ZIPs mais antigos que isso ou além da quantidade máxima são removidos
+IDADE_MAXIMA_EXPORTACAO_DIAS = 7
+MAXIMO_EXPORTACOES_EM_CACHE = 20
 
-# Inicializar estados da sessão
-if 'inventario_ativo' not in st.session_state:
-    st.session_state.inventario_ativo = None
-if 'itens_adicionados' not in st.session_state:
-    st.session_state.itens_adicionados = []
+# As sessões do Streamlit são threads do mesmo processo: uma trava por filtro
+# serializa a geração do ZIP e a troca das versões anteriores
+_travas_exportacao: Dict[str, threading.Lock] = {}
+_trava_travas_exportacao = threading.Lock()
+
+
+def _trava_exportacao(chave_filtro: str) -> threading.Lock:
+    with _trava_travas_exportacao:
+        return _travas_exportacao.setdefault(chave_filtro, threading.Lock())
+
+
+def _remover_exportacao(caminho: str):
+    """Remove um arquivo do cache, ignorando os já removidos por outra sessão
+    ou ainda abertos para download (Windows)"""
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
+
+
+def _limpar_cache_exportacoes(diretorio: str):
+    """Remove ZIPs expirados, o excesso de ZIPs (os mais antigos primeiro) e
+    temporários abandonados por execuções interrompidas"""
+    agora = datetime.now().timestamp()
+    limite = agora - IDADE_MAXIMA_EXPORTACAO_DIAS * 86400
+    zips = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        try:
+            modificado = os.path.getmtime(caminho)
+        except OSError:
+            continue
+        if nome.endswith('.tmp') and modificado < agora - 86400:
+            _remover_exportacao(caminho)
+        elif nome.endswith('.zip'):
+            if modificado < limite:
+                _remover_exportacao(caminho)
+            else:
+                zips.append((modificado, caminho))
+
+    for _, caminho in sorted(zips, reverse=True)[MAXIMO_EXPORTACOES_EM_CACHE:]:
+        _remover_exportacao(caminho)
+
+
+def gerar_zip_inventarios(db_manager: DatabaseManager, data_inicio: Optional[datetime] = None,
+                          data_fim: Optional[datetime] = None, responsavel: str = "",
+                          progresso: Optional[Callable[[int, int], None]] = None,
+                          processos: Optional[int] = None) -> Optional[BinaryIO]:
+    """Gera um ZIP em disco com o Excel de cada inventário filtrado e o retorna aberto
+    para leitura (o arquivo aberto continua legível mesmo que outra sessão o remova).
+
+    Os dados são lidos aqui e as planilhas são montadas em processos paralelos
+    (forkserver ou spawn, nunca fork do servidor), sendo gravadas no ZIP à medida
+    que ficam prontas, com no máximo duas por processo em memória. O arquivo fica
+    em cache até que os inventários filtrados mudem (ou o catálogo, para
+    inventários sem versão de catálogo fixada), respeitando os limites de
+    idade e quantidade do cache."""
+    inventarios = db_manager.obter_inventarios_periodo(data_inicio, data_fim, responsavel)
+    if inventarios.empty:
+        return None
+
+    # Chave do filtro e assinatura do conteúdo para o cache
+    chave_filtro = hashlib.sha256(
+        f"{os.path.abspath(db_manager.db_path)}|{data_inicio}|{data_fim}|{responsavel.strip()}".encode()
+    ).hexdigest()[:12]
+    conteudo_assinatura = inventarios[
+        ['id', 'total_itens', 'quantidade_total', 'ultimo_item_id', 'versao_catalogo']
+    ].to_csv(index=False)
+    if inventarios['versao_catalogo'].isna().any():
+        conteudo_assinatura += db_manager.assinatura_catalogo()
+    assinatura = hashlib.sha256(conteudo_assinatura.encode()).hexdigest()[:16]
+
+    diretorio = os.path.join(os.path.dirname(os.path.abspath(db_manager.db_path)), DIRETORIO_EXPORTACOES)
+    os.makedirs(diretorio, exist_ok=True)
+    prefixo = f"inventarios_{chave_filtro}_"
+    caminho_zip = os.path.join(diretorio, f"{prefixo}{assinatura}.zip")
+
+    total = len(inventarios)
+    with _trava_exportacao(chave_filtro):
+        try:
+            arquivo_zip = open(caminho_zip, 'rb')
+        except FileNotFoundError:
+            arquivo_zip = None
+
+        if arquivo_zip is None:
+            _gravar_zip_inventarios(db_manager, inventarios, diretorio, caminho_zip, progresso, processos)
+
+            # Substitui versões anteriores do mesmo filtro
+            for nome in os.listdir(diretorio):
+                caminho = os.path.join(diretorio, nome)
+                if nome.startswith(prefixo) and nome.endswith('.zip') and caminho != caminho_zip:
+                    _remover_exportacao(caminho)
+            arquivo_zip = open(caminho_zip, 'rb')
+        elif progresso:
+            progresso(total, total)
+
+    _limpar_cache_exportacoes(diretorio)
+    return arquivo_zip
+
+
+def _gravar_zip_inventarios(db_manager: DatabaseManager, inventarios: pd.DataFrame, diretorio: str,
+                            caminho_zip: str, progresso: Optional[Callable[[int, int], None]],
+                            processos: Optional[int]):
+    """Monta as planilhas em processos paralelos e grava o ZIP em um temporário
+    exclusivo, movido para caminho_zip apenas ao final"""
+    nomes = {
+        row['id']: f"{row['id']}_{nome_arquivo_inventario(row['responsavel'], row['data_formatada'])}"
+        for _, row in inventarios.iterrows()
+    }
+    ids = [int(inventario_id) for inventario_id in inventarios['id']]
+    total = len(ids)
+    descritor, caminho_temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+    os.close(descritor)
+    processos = processos or os.cpu_count() or 1
+    metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    concluidos = 0
+
+    try:
+        with zipfile.ZipFile(caminho_temporario, 'w', compression=zipfile.ZIP_DEFLATED) as arquivo_zip, \
+                ProcessPoolExecutor(max_workers=processos,
+                                    mp_context=multiprocessing.get_context(metodo)) as executor:
+            pendentes = set()
+            proximos = iter(ids)
+            while True:
+                # Limita as planilhas em memória enquanto o ZIP é gravado
+                for inventario_id in proximos:
+                    pendentes.add(executor.submit(
+                        gerar_planilha_exportacao,
+                        nomes[inventario_id],
+                        db_manager.obter_inventario_info(inventario_id),
+                        db_manager.obter_itens_inventario(inventario_id)
+                    ))
+                    if len(pendentes) >= processos * 2:
+                        break
+                if not pendentes:
+                    break
+
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    nome_arquivo, conteudo = futuro.result()
+                    arquivo_zip.writestr(nome_arquivo, conteudo)
+                    concluidos += 1
+                    if progresso:
+                        progresso(concluidos, total)
+
+        os.replace(caminho_temporario, caminho_zip)
+    finally:
+        if os.path.exists(caminho_temporario):
+            os.remove(caminho_temporario)
+
+
+# Configuração das tabelas paginadas
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+COLUNAS_TABELA_MATERIAIS = {
+    'codigo': 'Código',
+    'descricao': 'Descrição',
+    'data_cadastro': 'Data de Cadastro',
+}
+COLUNAS_TABELA_ITENS = {
+    'codigo_material': 'Código',
+    'descricao': 'Descrição',
+    'quantidade': 'Quantidade',
+}
+
+
+def _laco_manutencao(db_path: str):
+    """Verifica periodicamente se a manutenção automática está devida e a executa
+    dentro da janela configurada, sem bloquear as sessões"""
+    while True:
+        if DatabaseManager.em_janela_manutencao():
+            try:
+                DatabaseManager(db_path).executar_manutencao_agendada()
+            except sqlite3.Error:
+                # Banco ocupado ao abrir: tenta de novo na próxima verificação
+                pass
+        time.sleep(DatabaseManager.VERIFICACAO_MANUTENCAO_SEGUNDOS)
+
+
+@st.cache_resource
+def iniciar_manutencao_automatica(db_path: str) -> threading.Thread:
+    """Inicia a manutenção automática em segundo plano, uma vez por processo do servidor"""
+    thread = threading.Thread(
+        target=_laco_manutencao, args=(db_path,), name="manutencao-inventario", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+# Os processos da exportação em lote (forkserver/spawn) reexecutam este arquivo
+# como "__mp_main__"; neles a sessão e o banco não devem ser inicializados
+if __name__ != "__mp_main__":
+    # Inicializar o gerenciador de banco de dados
+    if 'db_manager' not in st.session_state:
+        st.session_state.db_manager = DatabaseManager()
+        iniciar_manutencao_automatica(os.path.abspath(st.session_state.db_manager.db_path))
+
+    # Inicializar estados da sessão
+    if 'inventario_ativo' not in st.session_state:
+        st.session_state.inventario_ativo = None
+    if 'itens_adicionados' not in st.session_state:
+        st.session_state.itens_adicionados = []
 
 
 def main():
@@ -464,6 +1198,62 @@ def main():
         tela_relatorios()
 
 
+def exibir_tabela_paginada(chave: str, contar: Callable, obter_pagina: Callable,
+                           colunas: Dict[str, str]) -> int:
+    """Exibe uma tabela paginada buscando no banco apenas a página visível"""
+    # Filtros por coluna
+    filtros = {}
+    for (coluna, rotulo), col in zip(colunas.items(), st.columns(len(colunas))):
+        with col:
+            filtros[coluna] = st.text_input(f"🔍 {rotulo}", key=f"{chave}_filtro_{coluna}")
+
+    total = contar(filtros)
+
+    col_ordem, col_direcao, col_tamanho, col_pagina = st.columns(4)
+
+    with col_ordem:
+        ordenar_por = st.selectbox(
+            "Ordenar por", options=list(colunas), format_func=colunas.get, key=f"{chave}_ordenar_por"
+        )
+
+    with col_direcao:
+        decrescente = st.selectbox(
+            "Ordem", options=["Crescente", "Decrescente"], key=f"{chave}_ordem"
+        ) == "Decrescente"
+
+    with col_tamanho:
+        tamanho_pagina = st.selectbox(
+            "Itens por página", options=TAMANHOS_PAGINA, index=1, key=f"{chave}_tamanho_pagina"
+        )
+
+    total_paginas = max(1, math.ceil(total / tamanho_pagina))
+    chave_pagina = f"{chave}_pagina"
+    chave_filtros = f"{chave}_filtros_anteriores"
+    # Um filtro novo sempre abre na primeira página
+    if st.session_state.get(chave_filtros, filtros) != filtros:
+        st.session_state[chave_pagina] = 1
+    st.session_state[chave_filtros] = filtros
+    # Ajustar a página atual quando o total de páginas diminui
+    if st.session_state.get(chave_pagina, 1) > total_paginas:
+        st.session_state[chave_pagina] = total_paginas
+
+    with col_pagina:
+        pagina = st.number_input(
+            "Página", min_value=1, max_value=total_paginas, step=1, key=chave_pagina
+        )
+
+    pagina_df = obter_pagina(pagina, tamanho_pagina, filtros, ordenar_por, decrescente)
+
+    inicio = (pagina - 1) * tamanho_pagina
+    st.caption(
+        f"Página {pagina} de {total_paginas} · "
+        f"Mostrando {inicio + 1 if total else 0}–{inicio + len(pagina_df)} de {total} registros"
+    )
+    st.dataframe(pagina_df, use_container_width=True, hide_index=True)
+
+    return total
+
+
 def tela_cadastro_materiais():
     st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
 
@@ -511,20 +1301,25 @@ def tela_cadastro_materiais():
 
     with col2:
         # Estatísticas
-        materiais_df = st.session_state.db_manager.obter_materiais()
+        total_materiais = st.session_state.db_manager.contar_materiais()
 
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             "📦 Total de Materiais",
-            len(materiais_df),
+            total_materiais,
             delta=None
         )
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Lista de materiais cadastrados
-    if not materiais_df.empty:
+    if total_materiais:
         st.subheader("📋 Materiais Cadastrados")
-        st.dataframe(materiais_df, use_container_width=True)
+        exibir_tabela_paginada(
+            "cadastro_materiais",
+            st.session_state.db_manager.contar_materiais,
+            st.session_state.db_manager.obter_materiais_pagina,
+            COLUNAS_TABELA_MATERIAIS
+        )
     else:
         st.info("Nenhum material cadastrado ainda. Faça o upload de uma planilha para começar.")
 
@@ -638,11 +1433,16 @@ def tela_rotina_inventario():
                         st.rerun()
 
         # Mostrar itens já adicionados
-        itens_inventario = st.session_state.db_manager.obter_itens_inventario(inventario_id)
+        total_itens_inventario = st.session_state.db_manager.contar_itens_inventario(inventario_id)
 
-        if not itens_inventario.empty:
+        if total_itens_inventario:
             st.subheader("📋 Itens no Inventário Atual")
-            st.dataframe(itens_inventario, use_container_width=True)
+            exibir_tabela_paginada(
+                f"itens_inventario_{inventario_id}",
+                partial(st.session_state.db_manager.contar_itens_inventario, inventario_id),
+                partial(st.session_state.db_manager.obter_itens_inventario_pagina, inventario_id),
+                COLUNAS_TABELA_ITENS
+            )
 
         # Botões de ação
         st.markdown("---")
@@ -650,13 +1450,14 @@ def tela_rotina_inventario():
 
         with col_finalizar:
             if st.button("✅ Finalizar Inventário"):
+                st.session_state.db_manager.finalizar_inventario(inventario_id)
                 st.session_state.inventario_ativo = None
                 st.session_state.itens_adicionados = []
                 st.success("✅ Inventário finalizado com sucesso!")
                 st.rerun()
 
         with col_excel:
-            if st.button("📊 Gerar Excel") and not itens_inventario.empty:
+            if st.button("📊 Gerar Excel") and total_itens_inventario:
                 excel_buffer = gerar_excel_inventario(inventario_id, st.session_state.db_manager)
 
                 st.download_button(
@@ -680,7 +1481,7 @@ def tela_relatorios():
     st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
     st.subheader("📊 Relatórios e Estatísticas")
 
-    materiais_df = st.session_state.db_manager.obter_materiais()
+    total_materiais = st.session_state.db_manager.contar_materiais()
     inventarios_df = st.session_state.db_manager.obter_todos_inventarios()
 
     # Métricas gerais
@@ -690,7 +1491,7 @@ def tela_relatorios():
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             "📦 Total de Materiais",
-            len(materiais_df)
+            total_materiais
         )
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -728,6 +1529,7 @@ def tela_relatorios():
                         <span><strong>📅 Data:</strong> {inventario['data_formatada']}</span>
                         <span><strong>📦 Itens:</strong> {inventario['total_itens']}</span>
                         <span><strong>📊 Quantidade Total:</strong> {int(inventario['quantidade_total']) if pd.notna(inventario['quantidade_total']) else 0}</span>
+                        {'<span><strong>🗄️ Arquivado</strong></span>' if inventario['arquivado'] else ''}
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
@@ -735,7 +1537,7 @@ def tela_relatorios():
             with col_btn:
                 # Botão para exportar Excel
                 excel_buffer = gerar_excel_inventario(inventario['id'], st.session_state.db_manager)
-                nome_arquivo = f"inventario_rezende_energia_{inventario['responsavel'].replace(' ', '_')}_{inventario['data_formatada'].replace('/', '')}.xlsx"
+                nome_arquivo = nome_arquivo_inventario(inventario['responsavel'], inventario['data_formatada'])
 
                 st.download_button(
                     label="📊 Excel",
@@ -750,33 +1552,112 @@ def tela_relatorios():
     else:
         st.info("📝 Nenhum inventário foi realizado ainda.")
 
+    # Exportação de vários inventários em um único ZIP
+    if not inventarios_df.empty:
+        with st.expander("📦 Exportação em Lote (ZIP)"):
+            col_periodo, col_responsavel = st.columns(2)
+
+            with col_periodo:
+                periodo = st.date_input(
+                    "📅 Período",
+                    value=(datetime.now() - timedelta(days=90), datetime.now()),
+                    format="DD/MM/YYYY",
+                    key="periodo_exportacao"
+                )
+
+            with col_responsavel:
+                responsavel_exportacao = st.text_input(
+                    "👤 Responsável (opcional)",
+                    key="responsavel_exportacao"
+                )
+
+            if st.button("📦 Gerar ZIP"):
+                data_inicio = datetime.combine(periodo[0], datetime.min.time()) if periodo else None
+                data_fim = (
+                    datetime.combine(periodo[-1], datetime.min.time()) + timedelta(days=1) if periodo else None
+                )
+                barra = st.progress(0.0, text="Gerando planilhas...")
+
+                arquivo_zip = gerar_zip_inventarios(
+                    st.session_state.db_manager, data_inicio, data_fim, responsavel_exportacao,
+                    progresso=lambda feitos, total: barra.progress(
+                        feitos / total, text=f"Gerando planilhas... {feitos}/{total}"
+                    )
+                )
+
+                if arquivo_zip is None:
+                    barra.empty()
+                    st.info("📝 Nenhum inventário encontrado para o filtro informado.")
+                else:
+                    with arquivo_zip:
+                        st.download_button(
+                            label="⬇️ Download ZIP",
+                            data=arquivo_zip,
+                            file_name=f"inventarios_rezende_energia_{datetime.now().strftime('%d%m%Y')}.zip",
+                            mime="application/zip"
+                        )
+
+    # Arquivamento manual e manutenção do banco
+    with st.expander("🗄️ Arquivamento e Manutenção do Banco"):
+        st.write(
+            "Inventários finalizados anteriores à data de corte são movidos para bancos de arquivo morto "
+            "(um por ano) e continuam disponíveis nos relatórios. A manutenção automática roda em segundo "
+            f"plano a cada {DatabaseManager.INTERVALO_MANUTENCAO_DIAS} dias, entre "
+            f"{DatabaseManager.JANELA_MANUTENCAO[0]}h e {DatabaseManager.JANELA_MANUTENCAO[1]}h. "
+            "Em bancos antigos, a primeira otimização "
+            "por este botão faz um VACUUM completo e bloqueia o banco por alguns instantes; "
+            "prefira executá-la fora do horário de contagem."
+        )
+
+        data_corte = st.date_input(
+            "📅 Arquivar inventários finalizados anteriores a",
+            value=datetime.now() - timedelta(days=DatabaseManager.DIAS_PARA_ARQUIVAMENTO),
+            format="DD/MM/YYYY"
+        )
+
+        if st.button("🗄️ Arquivar e Otimizar"):
+            with st.spinner("Arquivando inventários e otimizando o banco..."):
+                arquivados = st.session_state.db_manager.arquivar_inventarios(
+                    datetime.combine(data_corte, datetime.min.time())
+                )
+                # A conversão para vacuum incremental (VACUUM completo) só roda por aqui
+                otimizado = arquivados is not None and st.session_state.db_manager.manutencao_banco(
+                    converter_vacuum=True
+                )
+
+            if otimizado:
+                st.success(f"✅ {arquivados} inventário(s) arquivado(s) e banco otimizado!")
+
     # Lista de materiais cadastrados
-    if not materiais_df.empty:
+    if total_materiais:
         st.subheader("📦 Materiais Cadastrados")
 
         # Opção de exportar lista de materiais
         col_title, col_export = st.columns([3, 1])
 
         with col_title:
-            st.write(f"Total de **{len(materiais_df)}** materiais cadastrados no sistema")
+            st.write(f"Total de **{total_materiais}** materiais cadastrados no sistema")
 
         with col_export:
-            # Gerar Excel dos materiais
-            buffer_materiais = io.BytesIO()
-            with pd.ExcelWriter(buffer_materiais, engine='openpyxl') as writer:
-                materiais_df.to_excel(writer, sheet_name='Materiais Cadastrados', index=False)
-            buffer_materiais.seek(0)
-
-            st.download_button(
-                label="📊 Excel Materiais",
-                data=buffer_materiais.getvalue(),
-                file_name=f"materiais_rezende_energia_{datetime.now().strftime('%d%m%Y')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                help="Baixar lista completa de materiais"
-            )
+            # Gerar Excel dos materiais apenas quando solicitado (lê o catálogo completo)
+            if st.button("📊 Gerar Excel Materiais"):
+                buffer_materiais = gerar_excel_materiais(st.session_state.db_manager.obter_materiais())
+
+                st.download_button(
+                    label="⬇️ Excel Materiais",
+                    data=buffer_materiais.getvalue(),
+                    file_name=f"materiais_rezende_energia_{datetime.now().strftime('%d%m%Y')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    help="Baixar lista completa de materiais"
+                )
 
         # Exibir tabela de materiais
-        st.dataframe(materiais_df, use_container_width=True)
+        exibir_tabela_paginada(
+            "relatorio_materiais",
+            st.session_state.db_manager.contar_materiais,
+            st.session_state.db_manager.obter_materiais_pagina,
+            COLUNAS_TABELA_MATERIAIS
+        )
     else:
         st.info("📦 Nenhum material cadastrado ainda. Vá para a aba 'Cadastro de Materiais' para começar.")
 